@@ -1,10 +1,17 @@
+import numpy as np
 import pandas as pd
+import weakref
+from collections import OrderedDict
 from pathlib import Path
-from typing import Union, Callable, Optional
+from typing import Any, List, Tuple, Union, Callable, Optional
 from mlexpy.processor import ProcessPipelineBase
+from mlexpy.utils import df_fingerprint
 
 
 class IrisPipeline(ProcessPipelineBase):
+    # The number of processed (non-training) datasets to keep, so re-processing the same data is skipped.
+    transform_cache_size = 8
+
     def __init__(
         self,
         process_tag: str = "example_development_process",
@@ -15,6 +22,11 @@ class IrisPipeline(ProcessPipelineBase):
         super().__init__(
             process_tag, model_dir, model_storage_function, model_loading_function
         )
+        self.scaled_columns: List[str] = []
+        # Each entry keeps a weak reference to the dataframe it was processed from, as a fingerprint only holds its id.
+        self._transform_cache: OrderedDict[
+            Tuple[Any, ...], Tuple[weakref.ref, pd.DataFrame]
+        ] = OrderedDict()
 
     # Now -- define the .process_data() method.
     def process_data(
@@ -25,30 +37,67 @@ class IrisPipeline(ProcessPipelineBase):
     ) -> pd.DataFrame:
         """All data processing that is to be performed for the iris classification task."""
 
-        # Do a copy of the passed df
-        df = df.copy()
+        # The processing of a non-training dataset only applies models that are already fit, so if we have
+        # processed this same dataset before, re-use that result. Any new fit invalidates what is stored.
+        if training:
+            self._transform_cache.clear()
+        else:
+            fingerprint = df_fingerprint(df)
+            if fingerprint in self._transform_cache:
+                source_ref, cached_df = self._transform_cache[fingerprint]
+                # The id (in the fingerprint) of a freed dataframe can be re-used by a new one, so check this is
+                # still the same dataframe.
+                if source_ref() is df:
+                    self._transform_cache.move_to_end(fingerprint)
+                    return cached_df.copy()
+                del self._transform_cache[fingerprint]
+
+        # Do a (shallow) copy of the passed df. The copy only gets new columns added, and its columns index replaced,
+        # neither of which writes to the data shared with the passed df, so the passed df is never changed.
+        # (Keep a reference to the passed df itself, to store the result for.)
+        source_df = df
+        df = df.copy(deep=False)
 
         # First, compute the petal / sepal areas (but make the columns simpler)
-        df.columns = [col.replace(" ", "_").strip("_(cm)") for col in df.columns]
+        df.columns = df.columns.str.replace(" ", "_").str.strip("_(cm)")
 
-        for object in ["petal", "sepal"]:
-            df[f"{object}_area"] = df[f"{object}_length"] * df[f"{object}_width"]
+        # Compute both areas in a single array multiplication, and assign them together.
+        objects = ["petal", "sepal"]
+        lengths = df[[f"{object}_length" for object in objects]].to_numpy()
+        widths = df[[f"{object}_width" for object in objects]].to_numpy()
+        df[[f"{object}_area" for object in objects]] = lengths * widths
 
         # Now perform the training / testing dependent feature processing. This is why a `training` boolean is passed.
+        # Only the model based features are used for prediction, so don't keep the raw columns alongside them.
         if training:
             # Now FIT all of the model based features...
             self.fit_model_based_features(df)
             # ... and get the results of a transformation of all model based features.
-            model_features = self.transform_model_based_features(df)
+            model_features = self.transform_model_based_features(
+                df, keep_input_columns=False
+            )
         else:
             # Here we can ONLY apply the transformation
-            model_features = self.transform_model_based_features(df)
+            model_features = self.transform_model_based_features(
+                df, keep_input_columns=False
+            )
 
         # Imagine we only want to use the scaled features for prediction, then we retrieve only the scaled columns.
-        # (This is easy because the columns are renamed with the model name in the column name)
-        prediction_df = model_features[
-            [col for col in model_features if "standardscaler" in col]
-        ]
+        # These are known when the scaler is fit, otherwise (if the scaler was loaded from disk) find them once by
+        # name. (This is easy because the columns are renamed with the model name in the column name)
+        if not self.scaled_columns:
+            self.scaled_columns = [
+                col for col in model_features if "standardscaler" in col
+            ]
+        prediction_df = model_features.reindex(columns=self.scaled_columns, copy=False)
+
+        if not training:
+            self._transform_cache[fingerprint] = (
+                weakref.ref(source_df),
+                prediction_df.copy(),
+            )
+            if len(self._transform_cache) > self.transform_cache_size:
+                self._transform_cache.popitem(last=False)
 
         return prediction_df
 
@@ -61,14 +110,18 @@ class IrisPipeline(ProcessPipelineBase):
     ) -> pd.DataFrame:
         """All data processing that is to be performed for the iris classification task."""
 
-        # Do a copy of the passed df
-        df = df.copy()
+        # Do a (shallow) copy of the passed df. The copy only gets new columns added, and its columns index replaced,
+        # neither of which writes to the data shared with the passed df, so the passed df is never changed.
+        df = df.copy(deep=False)
 
         # First, compute the petal / sepal areas (but make the columns simpler)
-        df.columns = [col.replace(" ", "_").strip("_(cm)") for col in df.columns]
+        df.columns = df.columns.str.replace(" ", "_").str.strip("_(cm)")
 
-        for object in ["petal", "sepal"]:
-            df[f"{object}_area"] = df[f"{object}_length"] * df[f"{object}_width"]
+        # Compute both areas in a single array multiplication, and assign them together.
+        objects = ["petal", "sepal"]
+        lengths = df[[f"{object}_length" for object in objects]].to_numpy()
+        widths = df[[f"{object}_width" for object in objects]].to_numpy()
+        df[[f"{object}_area" for object in objects]] = lengths * widths
 
         # Now perform the training / testing dependent feature processing. This is why a `training` boolean is passed.
         if training:
@@ -98,12 +151,12 @@ class IrisPipeline(ProcessPipelineBase):
         # This case will result in additional columns on the dataframe named as
         # "<original-column-name>_StandardScaler()".
 
-        # Note: there are no returned values for this method, the result is an update in the self.column_transformations dictionary
+        # Note: there are no returned values for this method, the result is an update in the self.data_transformations dictionary
 
-        for column in df.columns:
-            if not self.check_numeric_column(df[column]):
-                continue
-            self.fit_scaler(df[column], standard_scaling=True)
+        # Fit a single scaler over all numerical columns at once, rather than one scaler per column.
+        numeric_df = df.select_dtypes(include=np.number)
+        self.fit_scaler(numeric_df, standard_scaling=True)
+        self.scaled_columns = [f"{col}_standardscaler" for col in numeric_df.columns]
 
     def fit_model_based_features_pca(self, df: pd.DataFrame, drop_columns=True) -> None:
         # Here we do any processing of columns that will require a model based transformation / engineering.
@@ -0,0 +1,127 @@
+import numpy as np
+from typing import Tuple
+from sklearn.preprocessing import StandardScaler
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# The minimum size (in bytes) of the data to fit, for using the compiled kernel rather than the StandardScaler fit.
+# Below this, the kernel's compilation / dispatch costs are larger than the time saved.
+MIN_KERNEL_BYTES = 1 << 22
+
+
+def _column_moments_numpy(data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute the mean and (population) variance of each column of a 2-D array.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        The 2-D (n_samples, n_features) array of float64 values.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+    """
+    means = data.mean(axis=0)
+    variances = ((data - means) ** 2).mean(axis=0)
+    return means, variances
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, cache=True)
+    def _column_moments_numba(data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Compute the mean and (population) variance of each column of a 2-D array, in parallel over the columns.
+
+        Each column is reduced with two passes (the sum, then the centered sum of squares), which is as stable as
+        the StandardScaler computation. The passes run down each column, so the data should be Fortran ordered.
+
+        Parameters
+        ----------
+        data : np.ndarray
+            The 2-D (n_samples, n_features) array of float64 values.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+        """
+        n_samples, n_features = data.shape
+        means = np.empty(n_features)
+        variances = np.empty(n_features)
+        for j in prange(n_features):
+            total = 0.0
+            for i in range(n_samples):
+                total += data[i, j]
+            mean = total / n_samples
+
+            squared_total = 0.0
+            for i in range(n_samples):
+                deviation = data[i, j] - mean
+                squared_total += deviation * deviation
+
+            means[j] = mean
+            variances[j] = squared_total / n_samples
+        return means, variances
+
+
+def column_moments(data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute the mean and (population) variance of each column of a 2-D array, with the compiled kernel if numba
+    is installed, and with NumPy otherwise.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        The 2-D (n_samples, n_features) array to reduce.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+    """
+    if NUMBA_AVAILABLE:
+        return _column_moments_numba(np.asfortranarray(data, dtype=np.float64))
+    return _column_moments_numpy(np.asarray(data, dtype=np.float64))
+
+
+def fit_standard_scaler(scaler: StandardScaler, data: np.ndarray) -> StandardScaler:
+    """Fit a (default) StandardScaler to a 2-D numeric array, by computing the column moments with column_moments,
+    and setting the fitted attributes the same way StandardScaler.fit does.
+
+    If the data has missing (or infinite) values, the moments are not finite, and the scaler is fit with
+    StandardScaler.fit instead (which ignores missing values), so the data is never scanned an extra time to check.
+
+    Parameters
+    ----------
+    scaler : StandardScaler
+        The instantiated scaler to fit.
+
+    data : np.ndarray
+        The 2-D (n_samples, n_features) array to fit the scaler to.
+
+    Returns
+    -------
+    StandardScaler
+    """
+    n_samples, n_features = data.shape
+    means, variances = column_moments(data)
+    if not (np.isfinite(means).all() and np.isfinite(variances).all()):
+        return scaler.fit(data)
+
+    # Treat (near) constant columns as StandardScaler does, giving them a scale of 1.
+    eps = np.finfo(np.float64).eps
+    constant_mask = (
+        variances <= n_samples * eps * variances + (n_samples * means * eps) ** 2
+    )
+    scale = np.sqrt(variances)
+    scale[constant_mask] = 1.0
+
+    scaler.n_features_in_ = n_features
+    scaler.n_samples_seen_ = np.int64(n_samples)
+    scaler.mean_ = means
+    scaler.var_ = variances
+    scaler.scale_ = scale
+    return scaler
@@ -1,13 +1,11 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
 import pandas as pd
-from pandas.api.types import is_numeric_dtype
+from pandas.api.types import is_integer_dtype, is_numeric_dtype
 import numpy as np
 import logging
-from joblib import dump, load
+import os
 import sys
 from pathlib import Path
-from typing import Dict, Optional, Any, Callable, Union, Tuple, Iterable, List
+from typing import Dict, Optional, Any, Callable, Union, Tuple, Iterable, List, Set
 
 from sklearn.metrics import (
     balanced_accuracy_score,
@@ -17,16 +15,16 @@ from sklearn.metrics import (
     accuracy_score,
     mean_absolute_error,
     roc_auc_score,
-    RocCurveDisplay,
     mean_squared_error,
     log_loss,
-    auc,
-    roc_curve,
 )
 
+# Note: plotting (matplotlib, seaborn) and model io (joblib) are only imported in the methods that use them, so
+# importing this module stays cheap, and works in environments without the plotting libraries installed.
+
 
 from mlexpy.pipeline_utils import MLSetup, ExperimentSetup, CrossValidation, CVEval
-from mlexpy.utils import make_directory
+from mlexpy.utils import make_directory, model_dump_kwargs
 
 
 logging.basicConfig(level=logging.INFO)
@@ -34,6 +32,37 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
+def import_pyplot() -> Any:
+    """Import matplotlib.pyplot, first selecting the non-interactive Agg backend when there is no display to
+    draw to, and no backend was chosen yet (ex. with matplotlib.use, a matplotlibrc, or $MPLBACKEND), so that
+    headless runs skip the GUI backend initialization.
+
+    Returns
+    -------
+    module
+        The matplotlib.pyplot module.
+    """
+    import matplotlib
+    from matplotlib import rcsetup
+
+    headless = (
+        sys.platform.startswith("linux")
+        and not os.environ.get("DISPLAY")
+        and not os.environ.get("WAYLAND_DISPLAY")
+    )
+    # (Read the backend without resolving it, as rcParams["backend"] would.)
+    backend_unset = (
+        dict.__getitem__(matplotlib.rcParams, "backend")
+        is rcsetup._auto_backend_sentinel
+    )
+    if headless and backend_unset and "ipykernel" not in sys.modules:
+        matplotlib.use("Agg")
+
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
 class ExperimentBase:
     """
     Base class to provide standard model experimentation tooling.
@@ -58,8 +87,13 @@ class ExperimentBase:
         A string to name the data processing methods. Used in naming the files that are dumped to disk.
     model_tag
         A string to define the model methods. Used in naming the files that are dumped to disk.
+    n_jobs
+        The number of parallel jobs to use when evaluating model setups in cross validated training. -1 uses all cores.
     pipeline
         The ProcessPipeline class to use to pre-process all data prior to modeling.
+    prediction_dtype
+        The dtype the (numeric) observations are converted to before predicting (ex. np.float32, for models that
+        cast their input to float32 anyway). If None (the default), no conversion is done.
 
     Methods
     -------
@@ -73,6 +107,8 @@ class ExperimentBase:
         The method to call to train the model. If a params arg is passed, then hyperparameter search is performed.
     predict(full_setup: ExperimentSetup, model: Any, proba: bool = False)
         The method to perform predictions for a model.
+    get_prediction_obs(obs: Any, model: Any)
+        A method to get the observations to predict over, converted to the prediction_dtype.
     cv_splits(n_splits: int = 5)
         A method to generate a cv-splitting method for cross validation.
     cv_search(data_setup: MLSetup, ml_model: Any, parameters: Dict[str, Any], cv_model: str = "random_search", random_iterations: int = 5)
@@ -100,6 +136,8 @@ class ExperimentBase:
         model_loading_function: Optional[Callable] = None,
         model_tag: str = "_development",
         process_tag: str = "_development",
+        n_jobs: int = -1,
+        prediction_dtype: Optional[type] = None,
     ) -> None:
         self.testing = test_setup
         self.training = train_setup
@@ -109,8 +147,10 @@ class ExperimentBase:
         self.metric_dict: Dict[str, Callable] = {}
         self.process_tag = process_tag
         self.model_tag = model_tag
+        self.n_jobs = n_jobs
         self.pipeline: Any
         self.standard_cv_scorer: Callable = lambda: None
+        self.prediction_dtype = prediction_dtype
 
         # Setup model io
         if not model_storage_function:
@@ -215,6 +255,9 @@ class ExperimentBase:
             else:
                 test_labels = self.testing.labels
 
+            if isinstance(self, ClassifierExperiment):
+                test_labels = self.compact_labels(test_labels)
+
             test_df = process_method(
                 self.testing.obs, training=False, label_series=test_labels
             )
@@ -241,6 +284,10 @@ class ExperimentBase:
                 train_labels = self.training.labels
                 test_labels = self.testing.labels
 
+            if isinstance(self, ClassifierExperiment):
+                train_labels = self.compact_labels(train_labels)
+                test_labels = self.compact_labels(test_labels)
+
             train_df = process_method(
                 df=self.training.obs, training=True, label_series=train_labels
             )
@@ -252,9 +299,10 @@ class ExperimentBase:
             f"The train data are of size {train_df.shape}, the test data are {test_df.shape}."
         )
 
-        assert (
-            len(set(train_df.index).intersection(set(test_df.index))) == 0
-        ), "There are duplicated indices in the train and test set."
+        # Note: like any assert, this check is skipped when running python with -O.
+        assert train_df.index.intersection(
+            test_df.index, sort=False
+        ).empty, "There are duplicated indices in the train and test set."
 
         return ExperimentSetup(
             MLSetup(
@@ -337,6 +385,7 @@ class ExperimentBase:
         random_search: bool = True,
         random_iterations: int = 5,
         cv_split_function: Optional[Callable] = None,
+        inner_n_jobs: Optional[int] = None,
     ) -> Any:
         """
         Perform cross-validated search over the hyperparameters for the best model parameters.
@@ -353,6 +402,11 @@ class ExperimentBase:
             A string defining the cv_search type to use. Either "random_search" or "grid_search".
         random_iterations : int
             The number of folds to use in the cross validation.
+        cv_split_function : Optional[Callable]
+            The sklearn style split function to use to generate the cv splits. By default a StratifiedShuffleSplit.
+        inner_n_jobs : Optional[int]
+            If provided, passed as the n_jobs parameter of the (multithreaded) model itself, ex. xgboost. Use this
+            together with the n_jobs attribute to balance the outer (setups in parallel) and inner parallelism.
 
         Returns
         -------
@@ -381,11 +435,15 @@ class ExperimentBase:
             random_seed=self.rnd.get_state(legacy=False)["state"]["key"][
                 -1
             ],  # needs to be an integer here
+            n_jobs=self.n_jobs,
         )
 
         if cv_split_function:
             cv_searcher.set_split_function(cv_split_function)
 
+        if inner_n_jobs is not None:
+            parameters = {**parameters, "n_jobs": [inner_n_jobs]}
+
         model = cv_searcher.train_model(
             ml_model,
             data_setup.train_data,
@@ -416,10 +474,41 @@ class ExperimentBase:
         -------
         nd.array
         """
+        obs = self.get_prediction_obs(data_setup.test_data.obs, model)
         if proba:
-            return model.predict_proba(data_setup.test_data.obs)
+            return model.predict_proba(obs)
         else:
-            return model.predict(data_setup.test_data.obs)
+            return model.predict(obs)
+
+    def get_prediction_obs(self, obs: Any, model: Any) -> Any:
+        """Get the observations to pass to a model for prediction, converted to the prediction_dtype.
+
+        The observations are converted on each call (never stored), so changes made to them between predictions are
+        always used. If the model was not fit with feature names, the numpy array is returned directly.
+
+        Parameters
+        ----------
+        obs : Any
+            The observations to predict over. Only a DataFrame of all numeric columns is converted.
+        model : Any
+            The model that will be used for prediction.
+
+        Returns
+        -------
+        Any (a pd.DataFrame or np.ndarray of the observations)
+        """
+        if (
+            self.prediction_dtype is None
+            or not isinstance(obs, pd.DataFrame)
+            or not all(is_numeric_dtype(dtype) for dtype in obs.dtypes)
+        ):
+            return obs
+
+        converted_obs = obs.astype(self.prediction_dtype)
+
+        if getattr(model, "feature_names_in_", None) is None:
+            return converted_obs.to_numpy()
+        return converted_obs
 
     def add_metric(self, metric: Callable, name: str) -> None:
         """
@@ -469,20 +558,23 @@ class ExperimentBase:
         -------
         None
         """
+        from joblib import dump
+
         self.make_storage_dir()
 
         if not file_name:
             file_name = self.model_tag
 
         if hasattr(model, "save_model"):
-            # use the model's saving utilities, specifically beneficial wish xgboost. Can be beneficial here to use a json
+            # use the model's saving utilities, specifically beneficial wish xgboost. Use the (binary) UBJSON format,
+            # which is smaller and faster to parse than json.
             logger.info(f"Found a save_model method in {model}")
-            model_path = self.model_dir / f"{file_name}.mdl"
+            model_path = self.model_dir / f"{file_name}.ubj"
             model.save_model(model_path)
         else:
             logger.info(f"Saving the {model} model using joblib.")
             model_path = self.model_dir / f"{file_name}.joblib"
-            dump(model, model_path)
+            dump(model, model_path, **model_dump_kwargs())
         logger.info(f"Dumped {self.model_tag} to: {model_path}")
 
     def default_load_model(self, model: Optional[Any] = None) -> Any:
@@ -497,11 +589,15 @@ class ExperimentBase:
         -------
         None
         """
+        from joblib import load
 
         if hasattr(model, "load_model") and model:
             # use the model's loading utilities -- specifically beneficial with xgboost
             logger.info(f"Found a load_model method in {model}")
-            model_path = self.model_dir / f"{self.model_tag}.mdl"
+            model_path = self.model_dir / f"{self.model_tag}.ubj"
+            if not model_path.is_file():
+                # Fall back to a model stored before the UBJSON format was used.
+                model_path = self.model_dir / f"{self.model_tag}.mdl"
             logger.info(f"Loading {self.model_tag} from: {model_path}")
             loaded_model = model.load_model(model_path)
             if loaded_model is None:
@@ -580,12 +676,19 @@ class ClassifierExperiment(ExperimentBase):
             The number of splits to perform in any cv hyperparameter grid search.
         self.metric_dict
             A Dictionary of metrics to use to evaluate the model predictions.
+        self.proba_metrics
+            The names of the metrics in the metric_dict that are evaluated on the class probabilities (when provided).
         self.standard_cv_scorer
             The "standard cv metric" to use. This is what will be use in CV hyperparameter search as an loss function to minimize.
         self.process_tag
             A string to name the data processing methods. Used in naming the files that are dumped to disk.
         self.model_tag
             A string to define the model methods. Used in naming the files that are dumped to disk.
+        self.n_jobs
+            The number of parallel jobs to use when evaluating model setups in cross validated training. -1 uses all cores.
+        self.prediction_dtype
+            The dtype the (numeric) observations are converted to before predicting (ex. np.float32, for models that
+            cast their input to float32 anyway). If None (the default), no conversion is done.
 
     Methods
     -------
@@ -599,20 +702,30 @@ class ClassifierExperiment(ExperimentBase):
         The method to call to train the model. If a params arg is passed, then hyperparameter search is performed.
     predict(full_setup: ExperimentSetup, model: Any, proba: bool = False)
         The method to perform predictions for a model.
+    get_prediction_obs(obs: Any, model: Any)
+        A method to get the observations to predict over, converted to the prediction_dtype.
     cv_splits(n_splits: int = 5)
         A method to generate a cv-splitting method for cross validation.
     cv_search(data_setup: MLSetup, ml_model: Any, parameters: Dict[str, Any], cv_model: str = "random_search", random_iterations: int = 5)
         The method to perform cross-validated hyperparameter optimization. Currently, only grid or random search are options.
-    add_metric(metric: Callable, name: str)
-        Add a metric function to the metric_dict
+    add_metric(metric: Callable, name: str, proba: bool = False)
+        Add a metric function to the metric_dict (and to proba_metrics if evaluated on the class probabilities)
     remove_metric(name: str)
         Remove a metric from the metric_dict
     default_store_model(model: Any, file_name: Optional[str] = None)
         Method to store a model. By default the model will be stored via joblib. Any model's native save method will be chosen here before joblib.
     default_load_model(model: Optional[Any] = None)
         Method to load a model. By default the model will be loaded via joblib. Any model's native load method will be chosen here before joblib.
-    evaluate_predictions(labels: Union[pd.Series, np.ndarray], predictions: Union[pd.Series, np.ndarray], class_probabilities: Optional[np.ndarray] = None, baseline_value: Optional[Union[float, int]] = None)
+    evaluate_predictions(labels: Union[pd.Series, np.ndarray], predictions: Union[pd.Series, np.ndarray], class_probabilities: Optional[np.ndarray] = None, baseline_value: Optional[Union[float, int]] = None, also_baseline: bool = False)
         Method to evaluate the predictions via classification metrics.
+    evaluate_metrics(labels: Union[pd.Series, np.ndarray], evaluation_prediction: Union[pd.Series, np.ndarray], cm: np.ndarray, class_probabilities: Optional[np.ndarray] = None)
+        Method to evaluate each metric of the metric_dict, given the confusion matrix of the predictions.
+    model_and_baseline_confusion_matrices(labels: Union[pd.Series, np.ndarray], predictions: Union[pd.Series, np.ndarray], baseline_value: Union[float, int])
+        Method to compute the confusion matrices of the predictions and of a constant baseline in one pass.
+    compact_labels(labels: pd.Series)
+        Method to store integer class labels as int32.
+    confusion_matrix_scores(cm: np.ndarray)
+        Method to compute the f1 (macro, micro, and weighted), accuracy, and balanced accuracy scores from a confusion matrix.
     evaluate_roc_metrics(full_setup: ExperimentSetup, class_probabilities: np.ndarray, model: Any)
         Method to evaluate specifically the AU_ROC curve metrics.
     plot_multiclass_roc(labels: Union[pd.Series, np.ndarray], class_probabilities: np.ndarray, fig_size: Tuple[int, int] = (8, 8))
@@ -630,6 +743,8 @@ class ClassifierExperiment(ExperimentBase):
         model_loading_function: Optional[Callable] = None,
         model_tag: str = "_development",
         process_tag: str = "_development",
+        n_jobs: int = -1,
+        prediction_dtype: Optional[type] = None,
     ) -> None:
         super().__init__(
             train_setup,
@@ -641,6 +756,8 @@ class ClassifierExperiment(ExperimentBase):
             model_loading_function,
             model_tag,
             process_tag,
+            n_jobs,
+            prediction_dtype,
         )
         self.metric_dict = {
             "f1": f1_score,
@@ -650,17 +767,58 @@ class ClassifierExperiment(ExperimentBase):
             "confusion_matrix": confusion_matrix,
             "classification_report": classification_report,
         }
+        self.proba_metrics: Set[str] = {"log_loss"}
         self.standard_cv_scorer = lambda labels, preds: -f1_score(
             labels, preds, average="macro"
         )
 
+    def add_metric(self, metric: Callable, name: str, proba: bool = False) -> None:
+        """
+        Add a metric to the metric dict that is called in evaluation.
+
+        Parameters
+        ----------
+        metric : Callable
+            The metric function. Needs to accept (labels, predictions), or (labels, class_probabilities) if proba.
+
+        name : str
+            The name of the metric.
+
+        proba : bool
+            A boolean flag to designate that the metric is evaluated on the class probabilities, rather than the
+            predicted classes.
+
+        Returns
+        -------
+        None
+        """
+        self.metric_dict[name] = metric
+        if proba:
+            self.proba_metrics.add(name)
+
+    def remove_metric(self, name: str) -> None:
+        """Remove a metric to the metric dict that is called in evaluation.
+
+        Parameters
+        ----------
+        name : str
+            The name of the metric.
+
+        Returns
+        -------
+        None
+        """
+        del self.metric_dict[name]
+        self.proba_metrics.discard(name)
+
     def evaluate_predictions(
         self,
         labels: Union[pd.Series, np.ndarray],
         predictions: Union[pd.Series, np.ndarray],
         class_probabilities: Optional[np.ndarray] = None,
         baseline_value: Optional[Union[float, int]] = None,
-    ) -> Dict[str, float]:
+        also_baseline: bool = False,
+    ) -> Dict[str, Any]:
         """Evaluate all predictions, and return the results in a dict.
 
         Parameters
@@ -670,24 +828,101 @@ class ClassifierExperiment(ExperimentBase):
         predictions : Union[pd.Series, np.ndarray]
             The class labels predicted from the model.
         class_probabilities : Optional[np.ndarray]
-            The probability prediction of each class.
+            The probability prediction of each class. Used for the metrics named in proba_metrics (ex. log_loss).
         baseline_value : Optional[Union[float, int]]
             If provided, will be used as a single value for every class. Ex. the most common class.
+        also_baseline : bool
+            A boolean flag to evaluate both the predictions and the baseline_value in one call, sharing a single pass
+            over the labels. If True, the results are returned as {"model": ..., "baseline": ...}.
 
         Returns
         -------
-        Dict[str, float]
+        Dict[str, Any]
         """
-
-        if baseline_value:
+        if also_baseline:
+            if baseline_value is None:
+                raise ValueError(
+                    "A baseline_value must be provided to evaluate the baseline alongside the predictions."
+                )
+            model_cm, baseline_cm = self.model_and_baseline_confusion_matrices(
+                labels, predictions, baseline_value
+            )
+            results = {
+                "model": self.evaluate_metrics(
+                    labels, predictions, model_cm, class_probabilities
+                ),
+                "baseline": self.evaluate_metrics(
+                    labels, np.repeat(baseline_value, len(labels)), baseline_cm
+                ),
+            }
+            if logger.isEnabledFor(logging.INFO):
+                for variant, result_dict in results.items():
+                    logger.info(
+                        f"{variant} metrics: "
+                        + ", ".join(
+                            f"{name}={score}" for name, score in result_dict.items()
+                        )
+                    )
+            return results
+
+        if baseline_value is not None:
             evaluation_prediction = np.repeat(baseline_value, len(labels))
         else:
             evaluation_prediction = predictions
 
-        result_dict: Dict[str, float] = {}
+        # The f1, accuracy, and balanced accuracy scores can all be derived from the confusion matrix, so compute it
+        # only once.
+        classes = np.union1d(labels, evaluation_prediction)
+        cm = confusion_matrix(labels, evaluation_prediction, labels=classes)
+
+        result_dict = self.evaluate_metrics(
+            labels,
+            evaluation_prediction,
+            cm,
+            None if baseline_value is not None else class_probabilities,
+        )
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "metrics: "
+                + ", ".join(f"{name}={score}" for name, score in result_dict.items())
+            )
+
+        return result_dict
+
+    def evaluate_metrics(
+        self,
+        labels: Union[pd.Series, np.ndarray],
+        evaluation_prediction: Union[pd.Series, np.ndarray],
+        cm: np.ndarray,
+        class_probabilities: Optional[np.ndarray] = None,
+    ) -> Dict[str, Any]:
+        """Evaluate each metric of the metric_dict for a set of predictions, given their confusion matrix.
+
+        Parameters
+        ----------
+        labels : Union[pd.Series, np.ndarray]
+            The true class labels for the data.
+        evaluation_prediction : Union[pd.Series, np.ndarray]
+            The class labels predicted (or the repeated baseline value).
+        cm : np.ndarray
+            The confusion matrix of the labels and evaluation_prediction, over all classes present in either.
+        class_probabilities : Optional[np.ndarray]
+            The probability prediction of each class. Used for the metrics named in proba_metrics (ex. log_loss).
+
+        Returns
+        -------
+        Dict[str, Any]
+        """
+        cm_scores = self.confusion_matrix_scores(cm)
+
+        result_dict: Dict[str, Any] = {}
         # First test the predictions in the metric dictionary...
         for name, metric in self.metric_dict.items():
-            if "f1" in name:
+            if "f1" in name and metric is f1_score:
+                for average in ["macro", "micro", "weighted"]:
+                    result_dict[f"{name}_{average}"] = cm_scores[f"f1_{average}"]
+            elif "f1" in name:
                 result_dict[name + "_macro"] = metric(
                     labels, evaluation_prediction, average="macro"
                 )
@@ -699,21 +934,156 @@ class ClassifierExperiment(ExperimentBase):
                     evaluation_prediction,
                     average="weighted",
                 )
+            elif metric is accuracy_score:
+                result_dict[name] = cm_scores["accuracy"]
+            elif metric is balanced_accuracy_score:
+                result_dict[name] = cm_scores["balanced_accuracy"]
+            elif metric is confusion_matrix:
+                result_dict[name] = cm
             else:
+                # Metrics of the class probabilities are passed those, when available
+                if name in self.proba_metrics and class_probabilities is not None:
+                    metric_input = class_probabilities
+                else:
+                    metric_input = evaluation_prediction
                 try:
-                    result_dict[name] = metric(labels, evaluation_prediction)
+                    result_dict[name] = metric(labels, metric_input)
+                    continue
                 except ValueError:
-                    # See if we would succeed with using the class probabilities
-                    try:
-                        result_dict[name] = metric(labels, class_probabilities)
-                    except ValueError:
-                        print(f"Unknown issues with the {name} metric evaluation.")
-
-        for name, score in result_dict.items():
-            print(f"\nThe {name} score is: \n {score}.")
+                    if (
+                        metric_input is class_probabilities
+                        or class_probabilities is None
+                    ):
+                        logger.warning(
+                            f"Unknown issues with the {name} metric evaluation."
+                        )
+                        continue
+                # A metric not named in proba_metrics may still need the class probabilities, so try these as well.
+                try:
+                    result_dict[name] = metric(labels, class_probabilities)
+                except ValueError:
+                    logger.warning(f"Unknown issues with the {name} metric evaluation.")
 
         return result_dict
 
+    @staticmethod
+    def model_and_baseline_confusion_matrices(
+        labels: Union[pd.Series, np.ndarray],
+        predictions: Union[pd.Series, np.ndarray],
+        baseline_value: Union[float, int],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Compute the confusion matrices of both the predictions and a constant baseline prediction, with a single
+        pass over the labels.
+
+        The baseline predicts one class for every record, so its confusion matrix is the class counts of the labels
+        (the row sums of the predictions' confusion matrix) in the baseline class's column.
+
+        Parameters
+        ----------
+        labels : Union[pd.Series, np.ndarray]
+            The true class labels for the data.
+        predictions : Union[pd.Series, np.ndarray]
+            The class labels predicted from the model.
+        baseline_value : Union[float, int]
+            The single class predicted for every record by the baseline.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+        """
+        labels = np.asarray(labels)
+        predictions = np.asarray(predictions)
+        classes = np.union1d(np.union1d(labels, predictions), [baseline_value])
+        class_count = len(classes)
+
+        # Count each (label, prediction) pair in one pass, via its flat index in the class_count x class_count matrix
+        label_codes = np.searchsorted(classes, labels)
+        prediction_codes = np.searchsorted(classes, predictions)
+        joint_cm = np.bincount(
+            label_codes * class_count + prediction_codes,
+            minlength=class_count * class_count,
+        ).reshape(class_count, class_count)
+
+        baseline_joint_cm = np.zeros_like(joint_cm)
+        baseline_joint_cm[:, np.searchsorted(classes, baseline_value)] = joint_cm.sum(
+            axis=1
+        )
+
+        # Restrict each matrix to the classes present in its own labels or predictions (as confusion_matrix does).
+        label_present = joint_cm.sum(axis=1) > 0
+        model_classes = np.flatnonzero(label_present | (joint_cm.sum(axis=0) > 0))
+        baseline_classes = np.flatnonzero(label_present | (classes == baseline_value))
+
+        return (
+            joint_cm[np.ix_(model_classes, model_classes)],
+            baseline_joint_cm[np.ix_(baseline_classes, baseline_classes)],
+        )
+
+    @staticmethod
+    def compact_labels(labels: pd.Series) -> pd.Series:
+        """Store integer class labels (ex. the encoded labels) as int32, halving the memory scanned by the cv
+        splitting and the metrics compared to int64.
+
+        Parameters
+        ----------
+        labels : pd.Series
+            The class labels. Only integer labels that fit in an int32 are converted.
+
+        Returns
+        -------
+        pd.Series
+        """
+        if (
+            labels.empty
+            or not is_integer_dtype(labels)
+            or labels.min() < np.iinfo(np.int32).min
+            or labels.max() > np.iinfo(np.int32).max
+        ):
+            return labels
+        return labels.astype(np.int32)
+
+    @staticmethod
+    def confusion_matrix_scores(cm: np.ndarray) -> Dict[str, float]:
+        """Compute the f1 (macro, micro, and weighted), accuracy, and balanced accuracy scores from a confusion
+        matrix, rather than re-scanning the labels and predictions for each metric.
+
+        Parameters
+        ----------
+        cm : np.ndarray
+            A confusion matrix (rows are the true classes, columns the predicted classes), over all classes present
+            in either the labels or the predictions.
+
+        Returns
+        -------
+        Dict[str, float]
+        """
+        true_positives = np.diag(cm).astype(float)
+        false_positives = cm.sum(axis=0) - true_positives
+        false_negatives = cm.sum(axis=1) - true_positives
+        support = cm.sum(axis=1)
+
+        # Equivalent to 2 * precision * recall / (precision + recall), and 0 where a class has no true positives.
+        f1_denominator = 2 * true_positives + false_positives + false_negatives
+        f1 = np.divide(
+            2 * true_positives,
+            f1_denominator,
+            out=np.zeros_like(true_positives),
+            where=f1_denominator > 0,
+        )
+
+        # The balanced accuracy is the mean recall, over the classes that are present in the labels.
+        present = support > 0
+
+        return {
+            "f1_macro": float(f1.mean()),
+            "f1_micro": float(2 * true_positives.sum() / f1_denominator.sum()),
+            "f1_weighted": float(np.average(f1, weights=support)),
+            "accuracy": float(true_positives.sum() / cm.sum()),
+            "balanced_accuracy": float(
+                np.mean(true_positives[present] / support[present])
+            ),
+        }
+
     def evaluate_roc_metrics(
         self,
         full_setup: ExperimentSetup,
@@ -736,6 +1106,8 @@ class ClassifierExperiment(ExperimentBase):
         -------
         Dict[str, float]
         """
+        plt = import_pyplot()
+        from sklearn.metrics import RocCurveDisplay
 
         # First, check that there are more than 1 predictions
         if len(class_probabilities) <= 1:
@@ -748,16 +1120,17 @@ class ClassifierExperiment(ExperimentBase):
         if len(class_probabilities[0]) <= 2:
             logger.info("Computing the binary AU-ROC curve scores.")
             # Then this is binary classification. Note from sklearn docs: The probability estimates correspond
-            # to the **probability of the class with the greater label**
+            # to the **probability of the class with the greater label** (the last column). Take it as a contiguous
+            # array once, rather than having sklearn copy the strided column view in its input validation.
             result_dict["roc_auc_score"] = roc_auc_score(
                 y_true=full_setup.test_data.labels,
-                y_score=class_probabilities[:, 1],
+                y_score=np.ascontiguousarray(class_probabilities[:, -1]),
             )
             print(f"""\nThe ROC AUC score is: {result_dict["roc_auc_score"]}""")
 
             dsp = RocCurveDisplay.from_estimator(
                 estimator=model,
-                X=full_setup.test_data.obs,
+                X=self.get_prediction_obs(full_setup.test_data.obs, model),
                 y=full_setup.test_data.labels,
             )
             dsp.plot()
@@ -766,9 +1139,10 @@ class ClassifierExperiment(ExperimentBase):
         else:
             logger.info("Computing the multi-class AU-ROC curve scores.")
             # We are doing multiclass classification and need to use more parameters to calculate the roc
+            # (ascontiguousarray does not copy the, typically already contiguous, probabilities)
             result_dict["roc_auc_score"] = roc_auc_score(
                 y_true=full_setup.test_data.labels,
-                y_score=class_probabilities,
+                y_score=np.ascontiguousarray(class_probabilities),
                 average="weighted",
                 multi_class="ovr",
             )
@@ -804,17 +1178,31 @@ class ClassifierExperiment(ExperimentBase):
         -------
         Dict[str, float]
         """
+        plt = import_pyplot()
+        import seaborn as sns
+        from joblib import Parallel, delayed
+        from matplotlib.collections import LineCollection
+        from matplotlib.lines import Line2D
+        from sklearn.metrics import auc, roc_curve
 
         _, class_count = class_probabilities.shape
 
         fpr, tpr, roc_auc = {}, {}, {}
 
-        # First, calculate all of the explicit class roc curves...
-        y_test_dummies = pd.get_dummies(labels, drop_first=False).values
-        for i in range(class_count):
-            fpr[i], tpr[i], _ = roc_curve(
-                y_test_dummies[:, i], class_probabilities[:, i]
-            )
+        # First, one-hot encode the labels (in sorted label order) by indexing into an identity matrix...
+        label_values, label_codes = np.unique(np.asarray(labels), return_inverse=True)
+        y_test_dummies = np.eye(len(label_values), dtype=np.uint8)[label_codes]
+
+        # ... then calculate all of the explicit class roc curves. Each class's curve is independent, so compute
+        # them in parallel threads. (Transpose once, so each class's labels and scores are contiguous rows.)
+        class_labels = np.ascontiguousarray(y_test_dummies.T)
+        class_scores = np.ascontiguousarray(class_probabilities.T)
+        curves = Parallel(n_jobs=-1, prefer="threads")(
+            delayed(roc_curve)(class_labels[i], class_scores[i])
+            for i in range(class_count)
+        )
+        for i, (class_fpr, class_tpr, _) in enumerate(curves):
+            fpr[i], tpr[i] = class_fpr, class_tpr
             roc_auc[i] = auc(fpr[i], tpr[i])
 
         #  Construct all plots
@@ -825,15 +1213,30 @@ class ClassifierExperiment(ExperimentBase):
         ax.set_xlabel("False Positive Rate")
         ax.set_ylabel("True Positive Rate")
         ax.set_title("Receiver operating characteristic evaluation")
-        for i in range(class_count):
-            ax.plot(
-                fpr[i],
-                tpr[i],
-                label=f"ROC curve (area = {round(roc_auc[i], 2)}) for label {i}",
+        # Draw all of the class curves as a single collection (one artist, rather than a line per class), and
+        # label them with legend proxies of the same colors.
+        cycle_colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+        colors = [cycle_colors[i % len(cycle_colors)] for i in range(class_count)]
+        ax.add_collection(
+            LineCollection(
+                [np.column_stack([fpr[i], tpr[i]]) for i in range(class_count)],
+                colors=colors,
                 alpha=0.6,
             )
-
-        ax.legend(loc="best")
+        )
+        ax.legend(
+            handles=[
+                Line2D(
+                    [],
+                    [],
+                    color=colors[i],
+                    alpha=0.6,
+                    label=f"ROC curve (area = {round(roc_auc[i], 2)}) for label {i}",
+                )
+                for i in range(class_count)
+            ],
+            loc="best",
+        )
         ax.grid(alpha=0.4)
         sns.despine()
         plt.show()
@@ -863,6 +1266,11 @@ class RegressionExperiment(ExperimentBase):
             A string to name the data processing methods. Used in naming the files that are dumped to disk.
         self.model_tag
             A string to define the model methods. Used in naming the files that are dumped to disk.
+        self.n_jobs
+            The number of parallel jobs to use when evaluating model setups in cross validated training. -1 uses all cores.
+        self.prediction_dtype
+            The dtype the (numeric) observations are converted to before predicting (ex. np.float32, for models that
+            cast their input to float32 anyway). If None (the default), no conversion is done.
     Methods
     -------
     make_storage_dir()
@@ -875,6 +1283,8 @@ class RegressionExperiment(ExperimentBase):
         The method to call to train the model. If a params arg is passed, then hyperparameter search is performed.
     predict(full_setup: ExperimentSetup, model: Any, proba: bool = False)
         The method to perform predictions for a model.
+    get_prediction_obs(obs: Any, model: Any)
+        A method to get the observations to predict over, converted to the prediction_dtype.
     cv_splits(n_splits: int = 5)
         A method to generate a cv-splitting method for cross validation.
     cv_search(data_setup: MLSetup, ml_model: Any, parameters: Dict[str, Any], cv_model: str = "random_search", random_iterations: int = 5)
@@ -902,6 +1312,8 @@ class RegressionExperiment(ExperimentBase):
         model_loading_function: Optional[Callable] = None,
         model_tag: str = "_development",
         process_tag: str = "_development",
+        n_jobs: int = -1,
+        prediction_dtype: Optional[type] = None,
     ) -> None:
         super().__init__(
             train_setup,
@@ -913,6 +1325,8 @@ class RegressionExperiment(ExperimentBase):
             model_loading_function,
             model_tag,
             process_tag,
+            n_jobs,
+            prediction_dtype,
         )
         self.metric_dict = {
             "mse": mean_squared_error,
@@ -953,5 +1367,10 @@ class RegressionExperiment(ExperimentBase):
         # First test the predictions in the metric dictionary...
         for name, metric in self.metric_dict.items():
             result_dict[name] = metric(labels, evaluation_prediction)
-            print(f"\nThe {name} is: {result_dict[name]}")
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "metrics: "
+                + ", ".join(f"{name}={score}" for name, score in result_dict.items())
+            )
         return result_dict
@@ -1,9 +1,10 @@
 import numpy as np
 import pandas as pd
 import logging
-from typing import Any, Dict, Callable, Union, List
+from typing import Any, Dict, Callable, Optional, Union, List
 from collections import namedtuple
 from itertools import product
+from joblib import Parallel, delayed
 
 from sklearn.model_selection import StratifiedShuffleSplit, train_test_split
 
@@ -75,7 +76,10 @@ def get_stratified_train_test_data(
 
 
 class CrossValidation:
-    """A class to perform cross validated evaluation and training for any given ml model."""
+    """A class to perform cross validated evaluation and training for any given ml model.
+
+    The model setups in training are evaluated with n_jobs parallel jobs (-1 uses all cores).
+    """
 
     def __init__(
         self,
@@ -83,6 +87,7 @@ class CrossValidation:
         test_fraction: float,
         n_splits: int = 5,
         random_seed: int = 10,
+        n_jobs: int = 1,
     ) -> None:
 
         # set a default split function, and stratify field.
@@ -91,12 +96,16 @@ class CrossValidation:
 
         self.scorer = score_function
         self.cv_splits = n_splits
+        self.random_seed = random_seed
         self.rnd = np.random.RandomState(random_seed)
         self.test_frac = test_fraction
+        self.n_jobs = n_jobs
+        self._splitter: Optional[Any] = None
 
     def set_split_function(self, split_function: Callable) -> None:
         logger.info(f"Set the cv split method as {split_function}")
         self._split_method = split_function
+        self._splitter = None
 
     def set_stratify(self, stratify: bool) -> None:
         logger.info(f"Set the split stratify flag as {stratify}")
@@ -106,6 +115,9 @@ class CrossValidation:
         """
         Generate a sklearn cv split model for the dataset.
 
+        The split model is created once and then re-used. It is seeded with the integer random_seed (rather than
+        the shared self.rnd RandomState), so every .split() call on it returns the same splits.
+
         Parameters
         ----------
         split_function: Any
@@ -115,9 +127,13 @@ class CrossValidation:
         -------
             Any  (Returns the performed cv_split creator.)
         """
-        return self._split_method(
-            n_splits=self.cv_splits, test_size=self.test_frac, random_state=self.rnd
-        )
+        if self._splitter is None:
+            self._splitter = self._split_method(
+                n_splits=self.cv_splits,
+                test_size=self.test_frac,
+                random_state=self.random_seed,
+            )
+        return self._splitter
 
     def train_model(
         self,
@@ -167,11 +183,12 @@ class CrossValidation:
                 )
             setups = self.get_grid_search_setups(parameter_space)
 
-        # Next, iterate over the setups and compute the score
-        model_scores = [
-            self.validated_train(model, dataset, split_indices, setup, i)
+        # Next, compute the score of each setup. The setups are independent, so evaluate them in parallel (limiting
+        # how many are dispatched at once, to bound the memory used).
+        model_scores = Parallel(n_jobs=self.n_jobs, pre_dispatch="2*n_jobs")(
+            delayed(self.validated_train)(model, dataset, split_indices, setup, i)
             for i, setup in enumerate(setups)
-        ]
+        )
 
         # ... get the best scoring setup, and retrain over all data.
         best_score_idx = np.argmin(model_scores)
@@ -1,10 +1,12 @@
 import pandas as pd
+import numpy as np
 from pandas.api.types import is_numeric_dtype
-from typing import List, Any, Union, Optional, Callable, Set
+from typing import List, Any, Union, Optional, Callable, Set, Dict
 from joblib import dump, load
 import sys
 from pathlib import Path
 from glob import glob
+from functools import partial
 import logging
 from sklearn.preprocessing import (
     LabelEncoder,
@@ -13,9 +15,16 @@ from sklearn.preprocessing import (
     OneHotEncoder,
 )
 from sklearn.decomposition import PCA
+from sklearn.base import OneToOneFeatureMixin
 from sklearn.exceptions import NotFittedError
-from mlexpy.utils import df_assertion, series_assertion, make_directory
+from mlexpy.utils import (
+    df_assertion,
+    series_assertion,
+    make_directory,
+    model_dump_kwargs,
+)
 from mlexpy.defaultordereddict import DefaultOrderedDict
+from mlexpy._nb_scaler import NUMBA_AVAILABLE, MIN_KERNEL_BYTES, fit_standard_scaler
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -134,11 +143,11 @@ class ProcessPipelineBase:
         Perform sklearn's best column selection.
     fit_data_model(self, model: Any, feature_data: Union[pd.DataFrame, pd.Series], fit_method_name: str = "fit")
         Perform the data fitting and respective model storage.
-    fit_scaler(self, feature_data: pd.Series, standard_scaling: bool = True)
-        Fit a scaler model to a column, options include a standard scaler or a min-max scaler
+    fit_scaler(self, feature_data: Union[pd.DataFrame, pd.Series], standard_scaling: bool = True)
+        Fit a scaler model to a column (or to all columns of a dataframe at once), options include a standard scaler or a min-max scaler
     fit_model_based_features(self, df: pd.DataFrame)
         Fit the models based features to the passed dataframe. NOTE: This must be overwritten in the child class inheriting this class.
-    transform_model_based_features(self, df: pd.DataFrame)
+    transform_model_based_features(self, df: pd.DataFrame, keep_input_columns: bool = True)
         Perform all transformations of columns according to the entries in teh column_transformation dict, or according to what can be loaded at the provided model_dir.
     dump_feature_based_models()
         Store all of the current models performing some feature transformation to disk.
@@ -333,12 +342,13 @@ class ProcessPipelineBase:
         self.make_storage_dir()
 
         if hasattr(model, "save_model"):
-            # use the model's saving utilities, specifically beneficial wish xgboost. Can be beneficial here to use a json
+            # use the model's saving utilities, specifically beneficial wish xgboost. Use the (binary) UBJSON format,
+            # which is smaller and faster to parse than json.
             logger.info(f"Found a save_model method in {model}")
-            model.save_model(f"{model_path}.mdl")
+            model.save_model(f"{model_path}.ubj")
         else:
             logger.info(f"Saving the {model} model using joblib.")
-            dump(model, f"{model_path}.joblib")
+            dump(model, f"{model_path}.joblib", **model_dump_kwargs())
         logger.info(f"Dumped {model} to: {model_path}")
 
     def default_load_model(
@@ -466,6 +476,7 @@ class ProcessPipelineBase:
         feature_data: Union[pd.DataFrame, pd.Series],
         drop_columns: bool = False,
         fit_method_name: str = "fit",
+        fit_function: Optional[Callable] = None,
     ) -> None:
         """Do all model fitting here in a dataset (or subset) WIDE manner, such as dimensionality reduction.
         This guarantees that all models will be stored, dumped, and reloaded correctly, and conveniently.
@@ -485,15 +496,22 @@ class ProcessPipelineBase:
         drop_columns : bool
             Boolean flag to define if the columns transformed should be stored and additionally be dropped.
 
+        fit_function : Optional[Callable]
+            A function to fit the model with, called as fit_function(model, data), in place of the model's
+            fit_method_name method.
+
         Returns
         -------
         None
         """
-        if not hasattr(model, fit_method_name):
+        if fit_function is not None:
+            fit_call = partial(fit_function, model)
+        elif not hasattr(model, fit_method_name):
             raise NameError(
                 f"The {model} model has no {fit_method_name} method to use to fit a model."
             )
-        fit_call = getattr(model, fit_method_name)
+        else:
+            fit_call = getattr(model, fit_method_name)
 
         # Now perform the fitting according to the respective datatype provided.
         if isinstance(feature_data, pd.DataFrame):
@@ -519,17 +537,22 @@ class ProcessPipelineBase:
 
     def fit_scaler(
         self,
-        feature_data: pd.Series,
+        feature_data: Union[pd.DataFrame, pd.Series],
         standard_scaling: bool = True,
         drop_columns: bool = False,
         **kwargs,
     ) -> None:
         """Perform the feature scaling here. If this a prediction method, then load and fit.
 
+        If a DataFrame is passed, a single scaler is fit over all of its columns at once (the column statistics are
+        computed in one pass over the 2-D array), and each column is still transformed into its own
+        "<column-name>_<scaler-name>" column. For large DataFrames, if numba is installed, the standard scaler's
+        statistics are computed with a compiled kernel, parallel over the columns.
+
         Parameters
         ----------
-        feature_data : pd.Series
-            The data we would like to scale provided as a pandas Series.
+        feature_data : Union[pd.DataFrame, pd.Series]
+            The data we would like to scale provided as a pandas Series, or a DataFrame of columns to scale.
 
         standard_scaling : bool
             A boolean flag for if standard scaling should be used or not. If passed as False, then min-max scaling is used.
@@ -538,14 +561,41 @@ class ProcessPipelineBase:
         -------
         None
         """
+        if isinstance(feature_data, pd.DataFrame):
+            data_name = list(feature_data.columns)
+        else:
+            data_name = feature_data.name
+
         if standard_scaling:
-            logger.info(f"Fitting a standard scaler to {feature_data.name}.")
+            logger.info(f"Fitting a standard scaler to {data_name}.")
             scaler = StandardScaler(**kwargs)
         else:
-            logger.info(f"Fitting a minmax scaler to {feature_data.name}.")
+            logger.info(f"Fitting a minmax scaler to {data_name}.")
             scaler = MinMaxScaler(**kwargs)
 
-        self.fit_data_model(scaler, feature_data, drop_columns)
+        fit_function = None
+        if (
+            standard_scaling
+            and not kwargs
+            and NUMBA_AVAILABLE
+            and isinstance(feature_data, pd.DataFrame)
+            and feature_data.memory_usage(index=False).sum() >= MIN_KERNEL_BYTES
+            and all(
+                isinstance(dtype, np.dtype)
+                and (
+                    np.issubdtype(dtype, np.floating)
+                    or np.issubdtype(dtype, np.integer)
+                )
+                for dtype in feature_data.dtypes
+            )
+        ):
+            # Only plain numpy columns, as extension dtypes (ex. nullable Int64) convert to object arrays. Data with
+            # missing values is left to the StandardScaler fit by fit_standard_scaler.
+            fit_function = fit_standard_scaler
+
+        self.fit_data_model(
+            scaler, feature_data, drop_columns, fit_function=fit_function
+        )
 
     def fit_one_hot_encoding(
         self, feature_data: pd.Series, drop_columns: bool = True, **kwargs
@@ -663,7 +713,9 @@ class ProcessPipelineBase:
         """
         raise NotImplementedError("This needs to be implemented in the child class.")
 
-    def transform_model_based_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def transform_model_based_features(
+        self, df: pd.DataFrame, keep_input_columns: bool = True
+    ) -> pd.DataFrame:
         """Here apply all model based feature engineering models, previously fit with the fit_model_based_features method.
 
         The goal is to simply call this method, and perform a single, ordered set of operations on a dataset to provide
@@ -675,11 +727,18 @@ class ProcessPipelineBase:
         df : pd.DataFrame
             The data we would like to perform the model transformation on as a data frame.
 
+        keep_input_columns : bool
+            A boolean flag to designate if the columns of the passed df should be returned alongside the model based
+            features. If False, only the model based features are returned, and the two are never concatenated.
+
         Returns
         -------
         pd.DataFrame
         """
-        result_df = pd.DataFrame(index=df.index)
+        # Collect each transformed column by its name, and build the result frame once at the end, rather than
+        # growing (and copying) a result frame with each transformation. As when assigning to a frame column, a
+        # repeated name (ex. from re-fitting a transformation) keeps its first position, but the last value.
+        transformed_columns: Dict[str, np.ndarray] = {}
         if len(self.data_transformations) == 0:
             # First, check to see if there might be any files to load
             try:
@@ -691,7 +750,7 @@ class ProcessPipelineBase:
                 logger.info(
                     "\nContinuing with out loading any model based column transformations."
                 )
-                return df
+                return df if keep_input_columns else pd.DataFrame(index=df.index)
         else:
             # By default, store all models when performing a transformation
             if self.store_models:
@@ -723,35 +782,41 @@ class ProcessPipelineBase:
                 name_to_use = column
             for i, transformation in enumerate(transformations):
                 logger.info(f"Applying the {transformation} to {column_to_use}")
-                transformed_result = transformation.transform(data_to_use)
+                transformed_result = np.asarray(transformation.transform(data_to_use))
                 # Just use the name of the transformation (assuming it is a class)
                 transformation_name = transformation.__str__().lower().split("(")[0]
 
-                if transformed_result.shape[1] > 1:
+                if isinstance(column_to_use, list) and isinstance(
+                    transformation, OneToOneFeatureMixin
+                ):
+                    # A column-wise transformation fit over many columns at once (ex. a scaler), so keep the
+                    # resulting columns named after the columns they came from.
+                    result_names = [
+                        f"{col}_{transformation_name}" for col in column_to_use
+                    ]
+                elif transformed_result.shape[1] > 1:
                     # Then the resulting transformation is a matrix (ex. one hot encoding). Make it dataframe ammenable
                     if hasattr(transformation, "get_feature_names_out"):
                         columns = transformation.get_feature_names_out()
                     else:
-                        columns = list(range(len(transformed_result.shape[1])))
-                    transformed_df = pd.DataFrame(
-                        transformed_result,
-                        columns=columns,
-                        index=df.index,
-                    )
-                    transformed_df.columns = [
-                        f"{name_to_use}_{transformation_name}_{col}"
-                        for col in transformed_df.columns
+                        columns = range(transformed_result.shape[1])
+                    result_names = [
+                        f"{name_to_use}_{transformation_name}_{col}" for col in columns
                     ]
-                    result_df = pd.concat([result_df, transformed_df], axis=1)
                 else:
-                    result_df[
-                        f"{name_to_use}_{transformation_name}"
-                    ] = transformed_result
+                    result_names = [f"{name_to_use}_{transformation_name}"]
+
+                for j, result_name in enumerate(result_names):
+                    transformed_columns[result_name] = transformed_result[:, j]
 
         if not self.feature_reducer.columns_to_drop:
             self.feature_reducer.fit(self.columns_to_drop)
 
-        return self.feature_reducer.transform(pd.concat([df, result_df], axis=1))
+        transformed_df = pd.DataFrame(transformed_columns, index=df.index)
+        if not keep_input_columns:
+            return self.feature_reducer.transform(transformed_df)
+
+        return self.feature_reducer.transform(pd.concat([df, transformed_df], axis=1))
 
     def dump_feature_based_models(self) -> None:
         """Given the ordered dict of the model based features, dump each model, with the name of the model in the column_transformation dict.
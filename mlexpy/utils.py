@@ -1,5 +1,5 @@
 import pandas as pd
-from typing import Any, List, Callable, Dict
+from typing import Any, List, Callable, Dict, Tuple
 import logging
 from pathlib import Path
 import os
@@ -26,6 +26,29 @@ def make_directory(directory_path: Path) -> None:
     os.makedirs(directory_path)
 
 
+def model_dump_kwargs() -> Dict[str, Any]:
+    """Get the keyword arguments to pass to joblib.dump when storing a model.
+
+    Models are pickled with protocol 5 (which avoids extra copies of large numpy buffers), and compressed with lz4
+    if it is installed (lz4 is fast enough to cost very little time, while reducing what is written to disk).
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    Dict[str, Any]
+    """
+    try:
+        import lz4  # noqa: F401
+
+        compress: Any = ("lz4", 3)
+    except ImportError:
+        compress = 0
+    return {"compress": compress, "protocol": 5}
+
+
 def df_assertion(data_structure: Any) -> None:
     """Simply assert that the passed value is a dataframe type.
 
@@ -70,6 +93,33 @@ def series_assertion(data_structure: Any) -> None:
     ), f"The provided variable is not a pd.Series ({type(data_structure)}). Need to pass a Series."
 
 
+def df_fingerprint(df: pd.DataFrame, sample_rows: int = 64) -> Tuple[Any, ...]:
+    """Create a cheap, hashable fingerprint of a dataframe, to use as a cache key for its processed result.
+
+    The fingerprint is built from the object identity, shape, columns, and a hash of the first sample_rows rows,
+    so it does not scan the full dataframe. Note: an in-place change beyond the sampled rows is not detected, and
+    the id of a freed dataframe can be re-used by a new one, so a cache should also check it holds the same object.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The dataframe to fingerprint.
+    sample_rows : int
+        The number of leading rows to hash into the fingerprint.
+
+    Returns
+    -------
+    Tuple[Any, ...]
+    """
+    df_assertion(df)
+    return (
+        id(df),
+        df.shape,
+        tuple(df.columns),
+        int(pd.util.hash_pandas_object(df.iloc[:sample_rows]).sum()),
+    )
+
+
 def initial_filtering(
     df: pd.DataFrame, column_mask_functions: Dict[str, List[Callable]]
 ) -> pd.DataFrame:
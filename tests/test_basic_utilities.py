@@ -53,6 +53,25 @@ def test_assertion_functions(simple_series, simple_dataframe):
         utils.series_assertion(simple_series.values)
 
 
+def test_df_fingerprint(simple_dataframe):
+
+    # Assert that the same dataframe always gives the same fingerprint...
+    assert utils.df_fingerprint(simple_dataframe) == utils.df_fingerprint(
+        simple_dataframe
+    ), "The same dataframe is not giving the same fingerprint."
+
+    # ... and that a copy, or a change to the data, give a new fingerprint.
+    changed_df = simple_dataframe.copy()
+    assert utils.df_fingerprint(changed_df) != utils.df_fingerprint(
+        simple_dataframe
+    ), "A copy of a dataframe is giving the same fingerprint as the original."
+    changed_fingerprint = utils.df_fingerprint(changed_df)
+    changed_df.loc[0, "obs1"] = 100
+    assert (
+        utils.df_fingerprint(changed_df) != changed_fingerprint
+    ), "A change to the dataframe is not changing the fingerprint."
+
+
 def test_train_split(simple_dataframe):
 
     rs1 = np.random.RandomState(10)
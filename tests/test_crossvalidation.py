@@ -70,6 +70,15 @@ def test_cv_splitting(simple_binary_dataframe):
     assert any([i_1 != idcs_3[0][0][i] for i, i_1 in enumerate(idcs_1[0][0])])
     "The splitter data ARE the same when initializing DIFFERENT cv_splitter objects."
 
+    # Lastly, test that the splitter is re-used, and re-splitting the same data gives the same splits.
+    assert cv1.generate_splitter() is splitter_1
+    "The splitter object is re-created when generating it twice."
+    idcs_1_again = list(cv1.generate_splitter().split(dataobj.obs, dataobj.labels))
+    assert all(
+        [np.array_equal(split[0], idcs_1_again[i][0]) for i, split in enumerate(idcs_1)]
+    )
+    "The splitter data are NOT the same when splitting twice with the same cv_splitter object."
+
 
 def test_parameter_space(model_definitions):
 
@@ -100,3 +100,38 @@ def test_weighted_prob_metric(
     assert results["weighted_prob_correct"] == sum([0.05, 1, 1, 0.5, 1, 0]) / len(
         class_labels
     )
+
+
+def test_registered_prob_metric(
+    class_labels,
+    class_probabilities,
+    class_predictions,
+):
+    """Test that a metric registered as a probability metric is passed the class probabilities directly."""
+
+    passed_inputs = []
+
+    def test_metric(true_labels: pd.Series, predictions: np.ndarray) -> float:
+        passed_inputs.append(predictions)
+        return float(np.mean(predictions[np.arange(len(true_labels)), true_labels]))
+
+    exp_obj = experiment.ClassifierExperiment(
+        train_setup=None,
+        test_setup=None,
+    )
+
+    exp_obj.add_metric(test_metric, "weighted_prob_correct", proba=True)
+
+    results = exp_obj.evaluate_predictions(
+        class_labels, class_predictions, class_probabilities
+    )
+
+    # The metric is called exactly once, and on the probabilities
+    assert len(passed_inputs) == 1
+    assert passed_inputs[0] is class_probabilities
+    assert results["weighted_prob_correct"] == pytest.approx(
+        sum([0.05, 1, 1, 0.5, 1, 0]) / len(class_labels)
+    )
+
+    exp_obj.remove_metric("weighted_prob_correct")
+    assert "weighted_prob_correct" not in exp_obj.proba_metrics
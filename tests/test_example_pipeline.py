@@ -0,0 +1,128 @@
+import pytest
+import pandas as pd
+from pathlib import Path
+from importlib import util
+from pandas.testing import assert_frame_equal
+from fixtures import rs_10
+from sklearn.datasets import load_iris
+from mlexpy import experiment, pipeline_utils
+
+# The example pipeline lives with the examples, rather than in the package, so load it from its file. (Don't add the
+# examples to sys.path, as the default model directory is found from it.)
+_spec = util.spec_from_file_location(
+    "from_module_example",
+    Path(__file__).resolve().parents[1] / "examples" / "from_module_example.py",
+)
+from_module_example = util.module_from_spec(_spec)
+_spec.loader.exec_module(from_module_example)
+IrisPipeline = from_module_example.IrisPipeline
+
+
+@pytest.fixture
+def iris_data():
+    data = load_iris(as_frame=True)
+    return data["data"], data["target"]
+
+
+@pytest.fixture
+def iris_pipeline(tmp_path):
+    return IrisPipeline(process_tag="iris_test_process", model_dir=tmp_path)
+
+
+def test_refit_pipeline(iris_data, iris_pipeline):
+    """Test that re-fitting the pipeline gives the same features as fitting it once."""
+
+    obs, _ = iris_data
+    train_df, test_df = obs.iloc[:100], obs.iloc[100:]
+
+    first_train_df = iris_pipeline.process_data(train_df, training=True)
+    first_test_df = iris_pipeline.process_data(test_df, training=False)
+
+    refit_train_df = iris_pipeline.process_data(train_df, training=True)
+    refit_test_df = iris_pipeline.process_data(test_df, training=False)
+
+    assert first_test_df.shape == (50, 6)
+    assert refit_train_df.columns.is_unique
+    assert_frame_equal(refit_train_df, first_train_df)
+    assert_frame_equal(refit_test_df, first_test_df)
+
+
+def test_reprocess_experiment(iris_data, rs_10, tmp_path):
+    """Test that processing the data of an experiment twice gives the same datasets as processing it once."""
+
+    obs, labels = iris_data
+    experiment_setup = pipeline_utils.get_stratified_train_test_data(
+        train_data=obs,
+        label_data=labels,
+        test_frac=0.35,
+        random_state=rs_10,
+    )
+    experiment_obj = experiment.ClassifierExperiment(
+        train_setup=experiment_setup.train_data,
+        test_setup=experiment_setup.test_data,
+        process_tag="iris_test_process",
+        model_dir=tmp_path,
+    )
+    experiment_obj.set_pipeline(IrisPipeline)
+
+    first_datasets = experiment_obj.process_data()
+    second_datasets = experiment_obj.process_data()
+
+    assert second_datasets.train_data.obs.shape == (97, 6)
+    assert_frame_equal(second_datasets.train_data.obs, first_datasets.train_data.obs)
+    assert_frame_equal(second_datasets.test_data.obs, first_datasets.test_data.obs)
+
+
+def test_transform_cache(iris_data, iris_pipeline, monkeypatch):
+    """Test that re-processing the same (non-training) dataset re-uses the stored result."""
+
+    obs, _ = iris_data
+    train_df, test_df = obs.iloc[:100], obs.iloc[100:]
+    iris_pipeline.process_data(train_df, training=True)
+
+    transform_calls = []
+    transform = iris_pipeline.transform_model_based_features
+
+    def counted_transform(*args, **kwargs):
+        transform_calls.append(1)
+        return transform(*args, **kwargs)
+
+    monkeypatch.setattr(
+        iris_pipeline, "transform_model_based_features", counted_transform
+    )
+
+    first_df = iris_pipeline.process_data(test_df, training=False)
+    cached_df = iris_pipeline.process_data(test_df, training=False)
+
+    # Assert the second call is a cache hit, that returns a copy of the stored result...
+    assert len(transform_calls) == 1
+    assert_frame_equal(cached_df, first_df)
+    assert cached_df is not first_df
+    cached_df.iloc[0, 0] = -1000.0
+    assert_frame_equal(iris_pipeline.process_data(test_df, training=False), first_df)
+    assert len(transform_calls) == 1
+
+    # ... that a different dataframe with the same fingerprint (ex. after its id was re-used) is not a hit...
+    monkeypatch.setattr(
+        from_module_example, "df_fingerprint", lambda df: ("same-fingerprint",)
+    )
+    iris_pipeline.process_data(test_df, training=False)
+    iris_pipeline.process_data(test_df.copy(), training=False)
+    assert len(transform_calls) == 3
+
+    # ... and that a new fit clears the stored results.
+    iris_pipeline.process_data(train_df, training=True)
+    assert len(iris_pipeline._transform_cache) == 0
+
+
+def test_input_unchanged(iris_data, iris_pipeline):
+    """Test that processing a dataframe never changes the passed dataframe, nor any global pandas option."""
+
+    obs, _ = iris_data
+    original_obs = obs.copy()
+
+    iris_pipeline.process_data(obs, training=True)
+    iris_pipeline.process_data(obs, training=False)
+
+    assert_frame_equal(obs, original_obs)
+    assert not pd.get_option("mode.copy_on_write")
@@ -1,8 +1,20 @@
 import pytest
 from mlexpy import experiment
 import pandas as pd
+import numpy as np
+from pandas.testing import assert_series_equal
+import os
 from pathlib import Path
 import sys
+from sklearn.tree import DecisionTreeRegressor
+from sklearn.linear_model import LinearRegression
+from mlexpy.pipeline_utils import ExperimentSetup, MLSetup
+from sklearn.metrics import (
+    accuracy_score,
+    balanced_accuracy_score,
+    confusion_matrix,
+    f1_score,
+)
 
 
 def test_basic_processor_exceptions():
@@ -83,3 +95,154 @@ def test_metric_add_remove():
     exp.remove_metric(metric_name)
     # Assert that the metric dict is empty again
     assert len(exp.metric_dict) == 0
+
+
+def test_confusion_matrix_scores():
+    """Test that the scores derived from the confusion matrix match the sklearn metrics."""
+
+    rs = np.random.RandomState(10)
+    labels = rs.randint(0, 4, size=200)
+    predictions = np.where(rs.rand(200) < 0.7, labels, rs.randint(0, 5, size=200))
+
+    classes = np.union1d(labels, predictions)
+    scores = experiment.ClassifierExperiment.confusion_matrix_scores(
+        confusion_matrix(labels, predictions, labels=classes)
+    )
+
+    # Assert that each score is the same as computing the metric directly.
+    for average in ["macro", "micro", "weighted"]:
+        assert scores[f"f1_{average}"] == pytest.approx(
+            f1_score(labels, predictions, average=average)
+        )
+    assert scores["accuracy"] == pytest.approx(accuracy_score(labels, predictions))
+    assert scores["balanced_accuracy"] == pytest.approx(
+        balanced_accuracy_score(labels, predictions)
+    )
+
+
+def test_compact_labels():
+    """Test that integer labels are stored as int32, and all other labels are left as they are."""
+
+    labels = pd.Series([0, 1, 2, 1], index=[3, 4, 5, 6], name="target")
+    compact_labels = experiment.ClassifierExperiment.compact_labels(labels)
+
+    # Assert that the labels are the same, only stored as int32...
+    assert compact_labels.dtype == np.int32
+    assert_series_equal(compact_labels, labels, check_dtype=False)
+
+    # ... and that non-integer labels are not changed.
+    string_labels = pd.Series(["a", "b", "a"], name="target")
+    assert (
+        experiment.ClassifierExperiment.compact_labels(string_labels) is string_labels
+    )
+
+
+def test_evaluate_also_baseline():
+    """Test that evaluating the baseline alongside the predictions gives the results of evaluating each alone."""
+
+    rs = np.random.RandomState(20)
+    labels = pd.Series(rs.randint(0, 3, size=200))
+    # Include a class (4) that is only ever predicted, never a label.
+    predictions = pd.Series(
+        np.where(rs.rand(200) < 0.7, labels, rs.randint(0, 5, size=200))
+    )
+
+    exp_obj = experiment.ClassifierExperiment(train_setup=None, test_setup=None)
+    exp_obj.add_metric(confusion_matrix, "confusion_matrix")
+
+    # (A baseline of class 0 is evaluated as a baseline too, not as the model predictions.)
+    for baseline_value in [0, 1]:
+        results = exp_obj.evaluate_predictions(
+            labels, predictions, baseline_value=baseline_value, also_baseline=True
+        )
+        expected = {
+            "model": exp_obj.evaluate_predictions(labels, predictions),
+            "baseline": exp_obj.evaluate_predictions(
+                labels, predictions, baseline_value=baseline_value
+            ),
+        }
+
+        assert results.keys() == expected.keys()
+        for variant, variant_results in expected.items():
+            assert results[variant].keys() == variant_results.keys()
+            for name, score in variant_results.items():
+                assert np.array_equal(results[variant][name], score)
+        assert expected["baseline"]["accuracy"] == pytest.approx(
+            np.mean(labels == baseline_value)
+        )
+
+    # Assert that the baseline must be given to be evaluated.
+    with pytest.raises(ValueError):
+        exp_obj.evaluate_predictions(labels, predictions, also_baseline=True)
+
+
+def test_predict_uses_current_obs():
+    """Test that predicting after the test observations are changed in place uses the changed observations."""
+
+    rs = np.random.RandomState(30)
+    obs = pd.DataFrame(rs.rand(50, 2), columns=["x", "y"])
+    labels = pd.Series(rs.rand(50))
+    setup = ExperimentSetup(MLSetup(obs, labels), MLSetup(obs.copy(), labels))
+
+    exp_obj = experiment.RegressionExperiment(
+        train_setup=setup.train_data,
+        test_setup=setup.test_data,
+        prediction_dtype=np.float32,
+    )
+    model = DecisionTreeRegressor(random_state=0).fit(obs, labels)
+
+    first_predictions = exp_obj.predict(setup, model)
+    setup.test_data.obs["x"] = 0.0
+    second_predictions = exp_obj.predict(setup, model)
+
+    assert not np.array_equal(first_predictions, second_predictions)
+    assert np.array_equal(second_predictions, model.predict(setup.test_data.obs))
+
+
+def test_predict_default_dtype():
+    """Test that by default, a model predicts over the observations as they are (not converted to float32)."""
+
+    rs = np.random.RandomState(40)
+    # A feature far larger than float32 can represent exactly, with a (comparably) small target range.
+    obs = pd.DataFrame({"x": 1.6e9 + rs.rand(50) * 1e3, "y": rs.rand(50)})
+    labels = pd.Series((obs["x"] - 1.6e9) / 10 + obs["y"])
+    setup = ExperimentSetup(MLSetup(obs, labels), MLSetup(obs, labels))
+
+    exp_obj = experiment.RegressionExperiment(
+        train_setup=setup.train_data, test_setup=setup.test_data
+    )
+    model = LinearRegression().fit(obs, labels)
+
+    assert exp_obj.prediction_dtype is None
+    assert np.array_equal(exp_obj.predict(setup, model), model.predict(obs))
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="Agg is only chosen on linux."
+)
+@pytest.mark.parametrize(
+    "chosen_backend, expected_backend", [("", "agg"), ("svg", "svg")]
+)
+def test_import_pyplot_backend(chosen_backend, expected_backend):
+    """Test that the Agg backend is only selected when no backend was chosen (in a new process, as the backend is
+    global)."""
+
+    import subprocess
+
+    code = (
+        "import matplotlib\n"
+        f"if {chosen_backend!r}: matplotlib.use({chosen_backend!r})\n"
+        "from mlexpy.experiment import import_pyplot\n"
+        "print(import_pyplot().get_backend())\n"
+    )
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key not in ["DISPLAY", "WAYLAND_DISPLAY", "MPLBACKEND"]
+    }
+    env["PYTHONPATH"] = str(Path(__file__).resolve().parents[1])
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True
+    )
+
+    assert result.stdout.strip().splitlines()[-1].lower() == expected_backend
@@ -7,11 +7,13 @@ from fixtures import (
 )
 from mlexpy import processor
 import pandas as pd
+import numpy as np
+from numpy.testing import assert_allclose
 from pandas.testing import assert_series_equal, assert_frame_equal
 from pathlib import Path
 import sys
 
-from sklearn.preprocessing import LabelEncoder
+from sklearn.preprocessing import LabelEncoder, StandardScaler
 
 
 def test_basic_processor_exceptions(base_processor, simple_dataframe):
@@ -163,3 +165,160 @@ def test_storage_function():
 
     # Test that the model loaded in script is the same as retrieved from disk.
     assert all([r == loaded_results[i] for i, r in enumerate(results)])
+
+
+def test_dataframe_scaler(base_processor, to_scale_dataframe):
+    """Test that a single scaler fit over many columns transforms each column as its own scaler would."""
+
+    columns = ["obs1", "obs2", "obs3"]
+    base_processor.fit_scaler(to_scale_dataframe[columns], standard_scaling=True)
+    transformed_df = base_processor.transform_model_based_features(to_scale_dataframe)
+
+    # Assert that there is a single model stored for all of the columns...
+    assert len(base_processor.data_transformations) == 1
+
+    # ... and that each column is scaled, and named, as if it had been scaled alone.
+    for column in columns:
+        equivalent = (
+            to_scale_dataframe[column] - to_scale_dataframe[column].mean()
+        ) / to_scale_dataframe[column].std(ddof=0)
+        equivalent.name = f"{column}_standardscaler"
+        assert_series_equal(transformed_df[f"{column}_standardscaler"], equivalent)
+
+    # Assert that the input columns can be left out of the transformed result.
+    model_only_df = base_processor.transform_model_based_features(
+        to_scale_dataframe, keep_input_columns=False
+    )
+    assert list(model_only_df.columns) == [f"{col}_standardscaler" for col in columns]
+
+
+def test_scaler_kernel():
+    """Test that the column moment kernels fit a StandardScaler the same way StandardScaler.fit does."""
+
+    from mlexpy import _nb_scaler
+
+    random_state = np.random.RandomState(10)
+    data = random_state.normal(loc=3, scale=2, size=(500, 4))
+    data[:, 2] = 7.0  # a constant column
+
+    expected = StandardScaler().fit(data)
+
+    kernels = [_nb_scaler._column_moments_numpy]
+    if _nb_scaler.NUMBA_AVAILABLE:
+        kernels.append(_nb_scaler._column_moments_numba)
+
+    for kernel in kernels:
+        means, variances = kernel(np.asfortranarray(data))
+        assert_allclose(means, expected.mean_)
+        assert_allclose(variances, expected.var_, atol=1e-12)
+
+    fitted = _nb_scaler.fit_standard_scaler(StandardScaler(), data)
+    for attribute in ["mean_", "var_", "scale_"]:
+        assert_allclose(getattr(fitted, attribute), getattr(expected, attribute))
+    assert fitted.n_samples_seen_ == expected.n_samples_seen_
+    assert_allclose(fitted.transform(data), expected.transform(data), atol=1e-12)
+
+
+def test_numba_scaler(base_processor, monkeypatch):
+    """Test that fitting a scaler to a large DataFrame with the numba kernel gives the StandardScaler results."""
+
+    pytest.importorskip("numba")
+
+    monkeypatch.setattr(processor, "MIN_KERNEL_BYTES", 0)
+    random_state = np.random.RandomState(20)
+    df = pd.DataFrame(
+        random_state.normal(size=(200, 3)), columns=["obs1", "obs2", "obs3"]
+    )
+
+    base_processor.fit_scaler(df, standard_scaling=True)
+    transformed_df = base_processor.transform_model_based_features(
+        df, keep_input_columns=False
+    )
+
+    expected = StandardScaler().fit_transform(df.values)
+    assert_allclose(transformed_df.values, expected, atol=1e-12)
+
+
+def test_refit_transformation(base_processor, to_scale_dataframe):
+    """Test that re-fitting a transformation replaces the earlier result, rather than duplicating its columns."""
+
+    df = to_scale_dataframe[["obs1", "obs2"]]
+    for _ in range(2):
+        for column in df.columns:
+            base_processor.fit_scaler(df[column], standard_scaling=True)
+    refit_df = base_processor.transform_model_based_features(df)
+
+    assert list(refit_df.columns) == [
+        "obs1",
+        "obs2",
+        "obs1_standardscaler",
+        "obs2_standardscaler",
+    ]
+    # The last fit is the one that is used.
+    last_scaler = base_processor.data_transformations["obs1"][-1]
+    assert_allclose(
+        refit_df["obs1_standardscaler"].values,
+        last_scaler.transform(df[["obs1"]].values)[:, 0],
+    )
+
+
+def test_refit_dataframe_scaler(base_processor, to_scale_dataframe):
+    """Test that re-fitting a scaler over many columns gives each scaled column once, from the last fit."""
+
+    columns = ["obs1", "obs2", "obs3"]
+    for _ in range(2):
+        base_processor.fit_scaler(to_scale_dataframe[columns], standard_scaling=True)
+    refit_df = base_processor.transform_model_based_features(
+        to_scale_dataframe, keep_input_columns=False
+    )
+
+    assert list(refit_df.columns) == [f"{col}_standardscaler" for col in columns]
+    last_scaler = base_processor.data_transformations["~~".join(columns)][-1]
+    assert_allclose(
+        refit_df.values, last_scaler.transform(to_scale_dataframe[columns].values)
+    )
+
+
+def test_scaler_kernel_fallback(base_processor, monkeypatch):
+    """Test that DataFrames the scaler kernel can't fit (extension dtypes, missing values) are fit as by sklearn."""
+
+    monkeypatch.setattr(processor, "NUMBA_AVAILABLE", True)
+    monkeypatch.setattr(processor, "MIN_KERNEL_BYTES", 0)
+
+    random_state = np.random.RandomState(30)
+    values = random_state.randint(0, 100, size=(50, 2)).astype(float)
+    values[3, 0] = np.nan
+    dfs = [
+        pd.DataFrame(values, columns=["obs1", "obs2"]),
+        pd.DataFrame(values[4:], columns=["obs1", "obs2"]).astype("Int64"),
+    ]
+
+    for df in dfs:
+        base_processor.fit_scaler(df, standard_scaling=True)
+        scaler = base_processor.data_transformations["obs1~~obs2"][-1]
+        expected = StandardScaler().fit(df.values)
+        for attribute in ["mean_", "var_", "scale_"]:
+            assert_allclose(getattr(scaler, attribute), getattr(expected, attribute))
+
+
+def test_transform_without_models(to_scale_dataframe, tmp_path, monkeypatch):
+    """Test that transforming without any fit (or stored) models still respects keep_input_columns."""
+
+    empty_processor = processor.ProcessPipelineBase(
+        process_tag="no_models", model_dir=tmp_path, store_models=False
+    )
+
+    def no_stored_models():
+        raise FileNotFoundError("No stored models.")
+
+    monkeypatch.setattr(empty_processor, "load_feature_based_models", no_stored_models)
+
+    assert_frame_equal(
+        empty_processor.transform_model_based_features(to_scale_dataframe),
+        to_scale_dataframe,
+    )
+    model_only_df = empty_processor.transform_model_based_features(
+        to_scale_dataframe, keep_input_columns=False
+    )
+    assert model_only_df.empty
+    assert model_only_df.index.equals(to_scale_dataframe.index)